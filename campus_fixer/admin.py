@@ -1,14 +1,125 @@
 from django.contrib import admin
-from .models import UserProfile, Issue, IssueUpdate
+from django.core.paginator import Paginator
+from django.db import connection, DatabaseError
+from django.utils.functional import cached_property
+from .models import UserProfile, Issue, IssueUpdate, ArchivedIssue, ArchivedIssueUpdate, ArchivedComment
+
+# Below this many rows an exact COUNT(*) is cheap enough
+ESTIMATE_THRESHOLD = 10000
+
+
+def estimated_row_count(model):
+    """Row count from the database's table statistics, or None if unavailable."""
+    table = model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+            elif connection.vendor == 'sqlite':
+                # Filled in by ANALYZE; the first number of every row is the table size
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+            else:
+                return None
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if not row or row[0] is None:
+        return None
+    return int(str(row[0]).split()[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Use table statistics instead of COUNT(*) for unfiltered changelists."""
+
+    @cached_property
+    def count(self):
+        if not self.object_list.query.where:
+            estimate = estimated_row_count(self.object_list.model)
+            if estimate and estimate > ESTIMATE_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class TicketSearchMixin:
+    """
+    Search by exact ticket ID. The default search wraps each field in
+    UPPER()/LIKE, which the ticket_id index cannot serve.
+    """
+    ticket_search_field = 'ticket_id'
+    search_help_text = "Exact ticket ID, e.g. UAP1A2B3C4D"
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        return queryset.filter(**{self.ticket_search_field: search_term.upper()}), False
+
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'user_type', 'department']
+    list_select_related = ['user']
+    list_filter = ['user_type']
+    search_fields = ['user__username', 'user__email']
+    raw_id_fields = ['user']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 @admin.register(Issue)
-class IssueAdmin(admin.ModelAdmin):
-    list_display = ['ticket_id', 'user', 'category', 'department', 'status', 'created_at']
+class IssueAdmin(TicketSearchMixin, admin.ModelAdmin):
+    list_display = ['ticket_id', 'user', 'category', 'department', 'status', 'priority', 'building', 'created_at']
+    list_select_related = ['user']
+    list_filter = ['status', 'priority', 'building', 'category', 'department', 'is_emergency']
+    search_fields = ['ticket_id']
+    date_hierarchy = 'created_at'
+    raw_id_fields = ['user']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def save_model(self, request, obj, form, change):
+        obj._changed_by = request.user  # read by the status notification signal
+        super().save_model(request, obj, form, change)
 
 @admin.register(IssueUpdate)
-class IssueUpdateAdmin(admin.ModelAdmin):
+class IssueUpdateAdmin(TicketSearchMixin, admin.ModelAdmin):
     list_display = ['issue', 'updated_by', 'created_at']
+    list_select_related = ['issue', 'updated_by']
+    search_fields = ['issue__ticket_id']
+    ticket_search_field = 'issue__ticket_id'
+    raw_id_fields = ['issue', 'updated_by']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+class ArchivedInline(admin.TabularInline):
+    """Archived rows are history: shown, never edited."""
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+class ArchivedIssueUpdateInline(ArchivedInline):
+    model = ArchivedIssueUpdate
+    fields = ['update_text', 'updated_by', 'created_at']
+
+
+class ArchivedCommentInline(ArchivedInline):
+    model = ArchivedComment
+    fields = ['comment_text', 'user', 'created_at']
+
+
+@admin.register(ArchivedIssue)
+class ArchivedIssueAdmin(TicketSearchMixin, admin.ModelAdmin):
+    list_display = ['ticket_id', 'user', 'category', 'department', 'status', 'created_at', 'archived_at']
+    list_select_related = ['user']
+    list_filter = ['status', 'category', 'department']
+    search_fields = ['ticket_id']
+    date_hierarchy = 'created_at'
+    raw_id_fields = ['user']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    inlines = [ArchivedIssueUpdateInline, ArchivedCommentInline]
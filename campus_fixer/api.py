@@ -0,0 +1,282 @@
+import base64
+import json
+from datetime import datetime
+
+from django.contrib.auth import authenticate, login, logout
+from django.db.models import Q
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_datetime
+from django.middleware.csrf import get_token
+from django.views.decorators.csrf import ensure_csrf_cookie
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import require_http_methods
+
+from .archive import find_issue
+from .forms import IssueApiForm
+from .models import Issue, IssueUpdate, LostFoundComment, UserProfile, ArchivedIssue
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+# Columns a client may ask for with ?fields=, per model
+ISSUE_FIELDS = [
+    'ticket_id', 'anonymous', 'user_type', 'department', 'category', 'priority',
+    'building', 'location', 'description', 'image', 'status', 'created_at',
+    'updated_at', 'is_emergency',
+]
+UPDATE_FIELDS = ['update_text', 'updated_by', 'created_at']
+COMMENT_FIELDS = ['comment_text', 'user', 'created_at']
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def api_view(*methods, login_required=True):
+    """Login check, allowed methods, gzip and JSON errors for an API view."""
+    def decorator(view):
+        @gzip_page
+        @require_http_methods(methods)
+        def wrapper(request, *args, **kwargs):
+            if login_required and not request.user.is_authenticated:
+                return JsonResponse({'error': 'Authentication required'}, status=401)
+            try:
+                return view(request, *args, **kwargs)
+            except ApiError as e:
+                return JsonResponse({'error': str(e)}, status=e.status)
+        return wrapper
+    return decorator
+
+
+# ---------------------- HELPERS ----------------------
+def request_data(request):
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or '{}')
+        except ValueError:
+            raise ApiError("Invalid JSON body")
+        if not isinstance(data, dict):
+            raise ApiError("JSON body must be an object")
+        return data
+    return request.POST
+
+
+def _selected_fields(request, allowed):
+    fields = request.GET.get('fields')
+    if not fields:
+        return allowed
+    selected = [f for f in fields.split(',') if f]
+    unknown = set(selected) - set(allowed)
+    if unknown:
+        raise ApiError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return selected
+
+
+def _serialize(obj, fields):
+    data = {}
+    for name in fields:
+        value = getattr(obj, name if name not in ('user', 'updated_by') else f'{name}_id')
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif name == 'image':
+            value = value.url if value else None
+        data[name] = value
+    return data
+
+
+def _encode_cursor(timestamp, pk):
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{pk}".encode()).decode()
+
+
+def _decode_cursor(cursor):
+    try:
+        timestamp, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        timestamp, pk = parse_datetime(timestamp), int(pk)
+    except ValueError:
+        raise ApiError("Invalid cursor")
+    if timestamp is None:
+        raise ApiError("Invalid cursor")
+    return timestamp, pk
+
+
+def _paginate(request, queryset, order_field, fields):
+    """
+    Cursor pagination ordered by (order_field, id), oldest first.
+
+    Clients keep the last `next_cursor` and pass it back later to receive only
+    rows that changed since; `since=<ISO datetime>` does the same for a first sync.
+    Deleted and archived rows are not reported, so clients need an occasional full sync.
+    """
+    try:
+        limit = max(1, min(int(request.GET.get('limit', DEFAULT_LIMIT)), MAX_LIMIT))
+    except ValueError:
+        raise ApiError("limit must be an integer")
+
+    since = request.GET.get('since')
+    if since:
+        try:
+            # None for a malformed string, ValueError for an impossible date
+            since = parse_datetime(since)
+        except ValueError:
+            since = None
+        if since is None:
+            raise ApiError("since must be an ISO 8601 datetime")
+        queryset = queryset.filter(**{f'{order_field}__gt': since})
+
+    cursor = request.GET.get('cursor')
+    if cursor:
+        timestamp, pk = _decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(**{f'{order_field}__gt': timestamp}) | Q(**{order_field: timestamp, 'id__gt': pk})
+        )
+
+    columns = {'id', order_field} | {f for f in fields if f not in ('user', 'updated_by')}
+    columns |= {f'{f}_id' for f in fields if f in ('user', 'updated_by')}
+    rows = list(queryset.only(*columns).order_by(order_field, 'id')[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # With nothing new, hand the same cursor back so the client keeps its place
+    next_cursor = cursor or None
+    if rows:
+        last = rows[-1]
+        next_cursor = _encode_cursor(getattr(last, order_field), last.id)
+    return JsonResponse({
+        'results': [_serialize(row, fields) for row in rows],
+        'next_cursor': next_cursor,
+        'has_more': has_more,
+    })
+
+
+def _visible(user):
+    # Staff see everything; others see their own issues and the lost & found board
+    if user.is_staff:
+        return Q()
+    return Q(user=user) | Q(category='lost_found')
+
+
+def _visible_issues(user, model=Issue):
+    return model.objects.filter(_visible(user))
+
+
+def _find_visible(user, ticket_id, only=None, **filters):
+    issue = find_issue(ticket_id, _visible(user), only=only, **filters)
+    if issue is None:
+        raise Http404("No issue with this ticket ID")
+    return issue
+
+
+# ---------------------- SESSION ----------------------
+@api_view('GET', 'POST', login_required=False)
+@ensure_csrf_cookie
+def session(request):
+    """
+    GET returns a CSRF token (and sets the csrftoken cookie) for a new client.
+    POST with JSON `email` and `password` and that token in `X-CSRFToken`
+    logs in; the session cookie comes back with a fresh CSRF token.
+    """
+    if request.method == 'POST':
+        data = request_data(request)
+        user = authenticate(request, email=data.get('email'), password=data.get('password'))
+        if user is None:
+            raise ApiError("Invalid email or password", status=401)
+        login(request, user)
+
+    user = request.user
+    return JsonResponse({
+        'csrf_token': get_token(request),
+        'user': {'id': user.pk, 'username': user.username, 'is_staff': user.is_staff}
+        if user.is_authenticated else None,
+    })
+
+
+@api_view('POST')
+def session_logout(request):
+    logout(request)
+    return JsonResponse({'csrf_token': get_token(request)})
+
+
+# ---------------------- ISSUES ----------------------
+@api_view('GET', 'POST')
+def issue_list(request):
+    if request.method == 'POST':
+        form = IssueApiForm(request_data(request), request.FILES)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors}, status=400)
+        issue = form.save(commit=False)
+        issue.user = request.user
+        profile = UserProfile.objects.filter(user=request.user).first()
+        issue.user_type = profile.user_type if profile else 'student'
+        issue.save()
+        return JsonResponse(_serialize(issue, ISSUE_FIELDS), status=201)
+
+    fields = _selected_fields(request, ISSUE_FIELDS)
+    issues = _visible_issues(request.user)
+    for name in ('status', 'category', 'priority', 'building', 'department'):
+        if request.GET.get(name):
+            issues = issues.filter(**{name: request.GET[name]})
+    return _paginate(request, issues, 'updated_at', fields)
+
+
+@api_view('GET', 'PATCH')
+def issue_detail(request, ticket_id):
+    if request.method == 'PATCH':
+        # Django only parses form bodies for POST, so PATCH must be JSON
+        if request.content_type != 'application/json':
+            raise ApiError("PATCH needs a JSON body", status=415)
+        issue = get_object_or_404(Issue, ticket_id=ticket_id, user=request.user)
+        status = request_data(request).get('status')
+        if status not in dict(Issue.STATUS_CHOICES):
+            raise ApiError("Invalid status")
+        issue.status = status
+        issue._changed_by = request.user
+        issue.save(update_fields=['status', 'updated_at'])
+        return JsonResponse(_serialize(issue, ISSUE_FIELDS))
+
+    fields = _selected_fields(request, ISSUE_FIELDS)
+    # Closed tickets may have been moved to the archive
+    issue = _find_visible(request.user, ticket_id, only=['id', *fields])
+    return JsonResponse(_serialize(issue, fields))
+
+
+# ---------------------- ISSUE UPDATES ----------------------
+@api_view('GET', 'POST')
+def issue_updates(request, ticket_id):
+    issue = _find_visible(request.user, ticket_id, only=['id'])
+
+    if request.method == 'POST':
+        if not request.user.is_staff:
+            raise ApiError("Only staff can post updates", status=403)
+        if isinstance(issue, ArchivedIssue):
+            raise ApiError("Archived tickets are read-only", status=409)
+        update_text = request_data(request).get('update_text')
+        if not update_text:
+            raise ApiError("update_text is required")
+        update = IssueUpdate.objects.create(issue=issue, update_text=update_text, updated_by=request.user)
+        return JsonResponse(_serialize(update, UPDATE_FIELDS), status=201)
+
+    fields = _selected_fields(request, UPDATE_FIELDS)
+    return _paginate(request, issue.updates.all(), 'created_at', fields)
+
+
+# ---------------------- LOST & FOUND COMMENTS ----------------------
+@api_view('GET', 'POST')
+def issue_comments(request, ticket_id):
+    post = find_issue(ticket_id, only=['id'], category='lost_found')
+    if post is None:
+        raise Http404("No lost & found post with this ticket ID")
+
+    if request.method == 'POST':
+        if isinstance(post, ArchivedIssue):
+            raise ApiError("Archived posts are read-only", status=409)
+        comment_text = request_data(request).get('comment_text')
+        if not comment_text:
+            raise ApiError("comment_text is required")
+        comment = LostFoundComment.objects.create(post=post, user=request.user, comment_text=comment_text)
+        return JsonResponse(_serialize(comment, COMMENT_FIELDS), status=201)
+
+    fields = _selected_fields(request, COMMENT_FIELDS)
+    return _paginate(request, post.comments.all(), 'created_at', fields)
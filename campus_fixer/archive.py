@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import (
+    Issue, IssueUpdate, LostFoundComment,
+    ArchivedIssue, ArchivedIssueUpdate, ArchivedComment,
+)
+from .utils.cache import invalidate, RESOLVED_COUNT_KEY, DASHBOARD_STATS_KEY
+
+ARCHIVE_STATUSES = ['resolved', 'closed']
+
+# Issue columns copied as-is into ArchivedIssue
+ISSUE_COLUMNS = [
+    'ticket_id', 'user_id', 'anonymous', 'user_type', 'department', 'category',
+    'priority', 'building', 'location', 'description', 'status', 'created_at',
+    'updated_at', 'is_emergency',
+]
+
+
+def archivable_issues(days):
+    cutoff = timezone.now() - timedelta(days=days)
+    return Issue.objects.filter(status__in=ARCHIVE_STATUSES, updated_at__lt=cutoff).exclude(
+        Exists(ArchivedIssue.objects.filter(ticket_id=OuterRef('ticket_id')))
+    )
+
+
+def conflicting_issues(days):
+    """
+    Archivable tickets whose ID is already in the archive. They are skipped,
+    since copying them would break the unique ticket_id, and left for staff to sort out.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    return Issue.objects.filter(
+        status__in=ARCHIVE_STATUSES, updated_at__lt=cutoff,
+        ticket_id__in=ArchivedIssue.objects.values('ticket_id'),
+    )
+
+
+def find_issue(ticket_id, *conditions, only=None, **filters):
+    """
+    Return the live or archived ticket with this ID matching the given
+    filters, or None. Both have `updates` and `comments`, so callers can
+    treat them alike.
+    """
+    for model in (Issue, ArchivedIssue):
+        issues = model.objects.filter(*conditions, ticket_id=ticket_id, **filters)
+        if only:
+            issues = issues.only(*only)
+        issue = issues.first()
+        if issue is not None:
+            return issue
+    return None
+
+
+def archive_batch(days, batch_size):
+    """
+    Move up to `batch_size` tickets closed more than `days` ago, with their
+    updates and comments, into the archive tables in one transaction.
+    Returns the number of tickets moved.
+    """
+    with transaction.atomic():
+        issues = list(archivable_issues(days).order_by('id')[:batch_size])
+        if not issues:
+            return 0
+
+        ArchivedIssue.objects.bulk_create([
+            ArchivedIssue(image=issue.image.name or None, **{c: getattr(issue, c) for c in ISSUE_COLUMNS})
+            for issue in issues
+        ])
+        archived_ids = dict(
+            ArchivedIssue.objects.filter(ticket_id__in=[i.ticket_id for i in issues]).values_list('ticket_id', 'id')
+        )
+        issue_ids = {issue.id: archived_ids[issue.ticket_id] for issue in issues}
+
+        ArchivedIssueUpdate.objects.bulk_create([
+            ArchivedIssueUpdate(
+                issue_id=issue_ids[u.issue_id], update_text=u.update_text,
+                updated_by_id=u.updated_by_id, created_at=u.created_at,
+            )
+            for u in IssueUpdate.objects.filter(issue_id__in=issue_ids)
+        ])
+        ArchivedComment.objects.bulk_create([
+            ArchivedComment(
+                post_id=issue_ids[c.post_id], user_id=c.user_id,
+                comment_text=c.comment_text, created_at=c.created_at,
+            )
+            for c in LostFoundComment.objects.filter(post_id__in=issue_ids)
+        ])
+
+        # Cascades to the live updates and comments; image files stay in place
+        Issue.objects.filter(id__in=issue_ids).delete()
+
+    invalidate(RESOLVED_COUNT_KEY, DASHBOARD_STATS_KEY)
+    return len(issues)
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+# Everything request.user needs except the password hash, which stays in the
+# database; the session hash derived from it is cached instead.
+USER_CACHE_FIELDS = [field.attname for field in User._meta.concrete_fields if field.attname != 'password']
+
+
+def user_cache_key(user_id):
+    return f"auth_user:{user_id}"
+
+
+def cache_user(user):
+    if not settings.USER_CACHE_TIMEOUT:
+        return
+    data = [getattr(user, name) for name in USER_CACHE_FIELDS]
+    cache.set(user_cache_key(user.pk), (data, user.get_session_auth_hash()), settings.USER_CACHE_TIMEOUT)
+
+
+def _cached_user(entry):
+    data, session_hash = entry
+    # password is left deferred: reading it loads it from the database, and
+    # save() only writes the loaded fields
+    user = User.from_db('default', USER_CACHE_FIELDS, data)
+    user.get_session_auth_hash = lambda: session_hash
+    return user
+
+
+class EmailBackend(ModelBackend):
+    """
+    Authenticate with email + password in a single query, and serve the
+    per-request user lookup from the cache when it is shared by all workers.
+    Username login (admin) still goes through ModelBackend.
+    """
+
+    def authenticate(self, request, username=None, password=None, email=None, **kwargs):
+        if email is None:
+            return super().authenticate(request, username=username, password=password, **kwargs)
+
+        user = User.objects.filter(email=email).first()
+        if user is None:
+            # Hash anyway so a missing account takes as long as a wrong password
+            User().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def get_user(self, user_id):
+        if not settings.USER_CACHE_TIMEOUT:
+            return super().get_user(user_id)
+        entry = cache.get(user_cache_key(user_id))
+        if entry is not None:
+            user = _cached_user(entry)
+            return user if self.user_can_authenticate(user) else None
+        user = super().get_user(user_id)
+        if user is not None:
+            cache_user(user)
+        return user
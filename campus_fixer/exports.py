@@ -0,0 +1,224 @@
+import csv
+import importlib.util
+import itertools
+import os
+import tempfile
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.mail import send_mail
+from django.http import FileResponse, Http404, JsonResponse, QueryDict, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
+from django.utils import timezone
+
+from .forms import IssueExportForm
+from .models import Issue, ArchivedIssue, ExportJob
+from .notifications import notify
+
+CHUNK_SIZE = 2000
+
+# XLSX can only be sent once the whole workbook is built, so bigger exports
+# go to the background queue instead of holding the request open
+XLSX_INLINE_ROWS = 5000
+
+# Spreadsheet apps treat cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+HEADER = [
+    'Ticket', 'Reporter', 'User Type', 'Department', 'Category', 'Priority',
+    'Building', 'Location', 'Status', 'Emergency', 'Created', 'Updated', 'Description',
+]
+COLUMNS = [
+    'ticket_id', 'user__username', 'anonymous', 'user_type', 'department', 'category',
+    'priority', 'building', 'location', 'status', 'is_emergency', 'created_at',
+    'updated_at', 'description',
+]
+LABELS = {
+    'department': dict(Issue.DEPARTMENTS),
+    'category': dict(Issue.CATEGORIES),
+    'priority': dict(Issue.PRIORITY_CHOICES),
+    'building': dict(Issue.BUILDING_CHOICES),
+    'status': dict(Issue.STATUS_CHOICES),
+}
+
+
+# ---------------------- ROWS ----------------------
+def safe_cell(value):
+    """Quote user text that a spreadsheet would otherwise run as a formula."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+
+def filtered_issues(filters, model=Issue):
+    issues = model.objects.all()
+    for name in ('building', 'department', 'category', 'status', 'priority'):
+        if filters.get(name):
+            issues = issues.filter(**{name: filters[name]})
+    # Compare against datetimes rather than created_at__date so the index is used
+    tz = timezone.get_current_timezone()
+    if filters.get('date_from'):
+        issues = issues.filter(created_at__gte=datetime.combine(filters['date_from'], time.min, tz))
+    if filters.get('date_to'):
+        issues = issues.filter(created_at__lt=datetime.combine(filters['date_to'] + timedelta(days=1), time.min, tz))
+    return issues.order_by('created_at')
+
+
+def export_count(filters):
+    return sum(filtered_issues(filters, model).count() for model in (ArchivedIssue, Issue))
+
+
+def export_rows(filters):
+    """Yield the header and one list per issue, reading from a server-side cursor."""
+    yield HEADER
+    # Archived tickets first: they are the older ones
+    rows = itertools.chain.from_iterable(
+        filtered_issues(filters, model).values_list(*COLUMNS).iterator(chunk_size=CHUNK_SIZE)
+        for model in (ArchivedIssue, Issue)
+    )
+    for row in rows:
+        data = dict(zip(COLUMNS, row))
+        yield [safe_cell(value) for value in [
+            data['ticket_id'],
+            '' if data['anonymous'] else data['user__username'],
+            data['user_type'],
+            *(LABELS[name].get(data[name], data[name]) for name in ('department', 'category', 'priority', 'building')),
+            data['location'],
+            LABELS['status'].get(data['status'], data['status']),
+            'Yes' if data['is_emergency'] else 'No',
+            timezone.localtime(data['created_at']).strftime('%Y-%m-%d %H:%M'),
+            timezone.localtime(data['updated_at']).strftime('%Y-%m-%d %H:%M'),
+            data['description'],
+        ]]
+
+
+# ---------------------- WRITERS ----------------------
+class Echo:
+    """File-like object whose write() just returns the line for streaming."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(filters):
+    writer = csv.writer(Echo())
+    return (writer.writerow(row) for row in export_rows(filters))
+
+
+def write_csv(filters, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(export_rows(filters))
+
+
+def xlsx_available():
+    # XLSX export is optional; openpyxl is only imported when it is used
+    return importlib.util.find_spec('openpyxl') is not None
+
+
+def write_xlsx(filters, target):
+    from openpyxl import Workbook
+
+    # write_only keeps just the current row in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Issues')
+    for row in export_rows(filters):
+        sheet.append(row)
+    workbook.save(target)
+
+
+# ---------------------- BACKGROUND ----------------------
+def claim_next_job():
+    """Mark the oldest pending job as running and return it, or None."""
+    for job in ExportJob.objects.filter(status='pending').order_by('created_at')[:10]:
+        # The conditional update makes sure only one runner picks each job
+        if ExportJob.objects.filter(pk=job.pk, status='pending').update(status='running', started_at=timezone.now()):
+            job.status = 'running'
+            return job
+    return None
+
+
+def run_export_job(job):
+    """Write the job's file under EXPORT_ROOT and tell the user, whether it worked or not."""
+    form = IssueExportForm(QueryDict(job.query))
+    try:
+        if not form.is_valid():
+            raise ValueError(f"Invalid export filters: {form.errors.as_text()}")
+        os.makedirs(settings.EXPORT_ROOT, exist_ok=True)
+        (write_xlsx if job.format == 'xlsx' else write_csv)(form.cleaned_data, job.path)
+    except Exception as e:
+        if os.path.exists(job.path):
+            os.remove(job.path)
+        job.status, job.error = 'failed', str(e)
+        job.save(update_fields=['status', 'error'])
+        notify([job.user_id], 'export', "Your issue export failed, please try again")
+        return False
+
+    job.status = 'done'
+    job.save(update_fields=['status'])
+    notify([job.user_id], 'export', "Your issue export is ready", link=job.link)
+    send_mail(
+        "Your issue export is ready",
+        f"Download it from {job.link}",
+        None,
+        [job.user.email],
+        fail_silently=True,
+    )
+    return True
+
+
+# ---------------------- VIEW ----------------------
+def queue_export(request, fmt):
+    job = ExportJob(user=request.user, query=request.GET.urlencode(), format=fmt)
+    job.link = request.build_absolute_uri(reverse('export_download', args=[job.token]))
+    job.save()
+    return job
+
+
+@staff_member_required
+def export_issues(request):
+    form = IssueExportForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+    filters = form.cleaned_data
+    fmt = filters['format'] or 'csv'
+    if fmt == 'xlsx' and not xlsx_available():
+        return JsonResponse({'error': "XLSX export needs the openpyxl package"}, status=400)
+
+    if filters['background']:
+        queue_export(request, fmt)
+        messages.success(request, "Export queued. We'll email you a download link when it is ready ✅")
+        return redirect('admin:campus_fixer_issue_changelist')
+
+    if fmt == 'xlsx' and export_count(filters) > XLSX_INLINE_ROWS:
+        queue_export(request, fmt)
+        messages.success(
+            request,
+            f"Excel exports over {XLSX_INLINE_ROWS} rows are prepared in the background. "
+            "We'll email you a download link when it is ready ✅",
+        )
+        return redirect('admin:campus_fixer_issue_changelist')
+
+    stamp = f"{timezone.localtime():%Y%m%d}"
+    if fmt == 'xlsx':
+        # XLSX is a zip archive, so it is built in a temp file and then streamed
+        tmp = tempfile.TemporaryFile()
+        write_xlsx(filters, tmp)
+        tmp.seek(0)
+        return FileResponse(tmp, as_attachment=True, filename=f"issues-{stamp}.xlsx")
+
+    response = StreamingHttpResponse(stream_csv(filters), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="issues-{stamp}.csv"'
+    return response
+
+
+@staff_member_required
+def export_download(request, token):
+    job = get_object_or_404(ExportJob, token=token, user=request.user, status='done')
+    if not os.path.exists(job.path):
+        raise Http404("This export has been removed")
+    filename = f"issues-{timezone.localtime(job.created_at):%Y%m%d}.{job.format}"
+    return FileResponse(open(job.path, 'rb'), as_attachment=True, filename=filename)
@@ -48,3 +48,24 @@ class IssueForm(forms.ModelForm):
                 'required': True
             }),
         }
+
+
+class IssueApiForm(forms.ModelForm):
+    class Meta:
+        model = Issue
+        fields = ['anonymous', 'department', 'category', 'priority', 'building',
+                  'location', 'description', 'image', 'is_emergency']
+
+
+class IssueExportForm(forms.Form):
+    FORMATS = [('csv', 'CSV'), ('xlsx', 'Excel (XLSX)')]
+
+    building = forms.ChoiceField(choices=[('', 'All')] + Issue.BUILDING_CHOICES, required=False)
+    department = forms.ChoiceField(choices=[('', 'All')] + Issue.DEPARTMENTS, required=False)
+    category = forms.ChoiceField(choices=[('', 'All')] + Issue.CATEGORIES, required=False)
+    status = forms.ChoiceField(choices=[('', 'All')] + Issue.STATUS_CHOICES, required=False)
+    priority = forms.ChoiceField(choices=[('', 'All')] + Issue.PRIORITY_CHOICES, required=False)
+    date_from = forms.DateField(required=False)
+    date_to = forms.DateField(required=False)
+    format = forms.ChoiceField(choices=FORMATS, required=False)
+    background = forms.BooleanField(required=False)
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from campus_fixer.archive import archivable_issues, archive_batch, conflicting_issues
+
+
+class Command(BaseCommand):
+    help = "Move resolved/closed issues older than --days into the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ARCHIVE_AFTER_DAYS,
+                            help="Archive tickets closed more than this many days ago.")
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help="Tickets moved per transaction.")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only report how many tickets would be archived.")
+
+    def handle(self, *args, **options):
+        conflicts = list(conflicting_issues(options['days']).values_list('ticket_id', flat=True))
+        if conflicts:
+            self.stdout.write(self.style.WARNING(
+                f"Skipping {len(conflicts)} issues whose ticket ID is already archived: {', '.join(conflicts)}"
+            ))
+
+        if options['dry_run']:
+            count = archivable_issues(options['days']).count()
+            self.stdout.write(f"{count} issues would be archived")
+            return
+
+        total = 0
+        while True:
+            moved = archive_batch(options['days'], options['batch_size'])
+            if not moved:
+                break
+            total += moved
+            self.stdout.write(f"Archived {total} issues...")
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} issues"))
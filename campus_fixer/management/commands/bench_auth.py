@@ -0,0 +1,65 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+EMAIL = 'bench.auth@uap-bd.edu'
+PASSWORD = 'bench-pass-123'
+
+# The setup before EmailBackend and cached sessions
+BASELINE = {
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+    'AUTHENTICATION_BACKENDS': ['django.contrib.auth.backends.ModelBackend'],
+}
+# Cached sessions and users, as enabled with a shared CACHE_BACKEND
+CACHED = {
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+    'USER_CACHE_TIMEOUT': 60,
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+def count_queries(func):
+    with CaptureQueriesContext(connection) as ctx:
+        func()
+    return len(ctx)
+
+
+class Command(BaseCommand):
+    help = "Count DB queries for login and an authenticated page hit, before and after auth caching."
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                User.objects.create_user(username='bench.auth', email=EMAIL, password=PASSWORD)
+                with override_settings(**BASELINE):
+                    before = self.measure(self.baseline_login)
+                with override_settings(**CACHED):
+                    after = self.measure(self.email_login)
+                raise Rollback
+        except Rollback:
+            pass
+
+        for name in ('login', 'page'):
+            self.stdout.write(f"{name:6} before={before[name]:3}  after={after[name]:3}  saved={before[name] - after[name]}")
+
+    def baseline_login(self, client):
+        # What custom_login used to do: find the username by email, then authenticate by username
+        user = User.objects.get(email=EMAIL)
+        client.login(username=user.username, password=PASSWORD)
+
+    def email_login(self, client):
+        client.login(email=EMAIL, password=PASSWORD)
+
+    def measure(self, login_func):
+        client = Client()
+        client.get('/')  # warm the cached counters on the landing page
+        # Sign in, then follow the redirect to the landing page
+        login_queries = count_queries(lambda: (login_func(client), client.get('/')))
+        client.get('/track-issue/')
+        page_queries = count_queries(lambda: client.get('/track-issue/'))
+        return {'login': login_queries, 'page': page_queries}
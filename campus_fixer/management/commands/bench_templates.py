@@ -0,0 +1,95 @@
+import time
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+
+from campus_fixer.models import Issue
+
+# The track_issue row markup before choice labels and colours were precomputed,
+# kept here as the baseline.
+BASELINE_ROWS = """
+{% for issue in issues %}
+<div class="card" style="border-left: 5px solid
+    {% if issue.status == 'resolved' %}#10B981
+    {% elif issue.status == 'in_progress' %}#F59E0B
+    {% elif issue.status == 'closed' %}#6B7280
+    {% else %}#EF4444{% endif %};
+    background: rgba(255,255,255,0.15);
+    color: white;
+    padding: 1rem; border-radius: 12px;">
+    <h4>{{ issue.ticket_id }} - {{ issue.category|title }} ({{ issue.location }})</h4>
+    <span style="background:
+        {% if issue.status == 'resolved' %}#10B981
+        {% elif issue.status == 'in_progress' %}#F59E0B
+        {% elif issue.status == 'closed' %}#6B7280
+        {% else %}#EF4444{% endif %};
+        color: white; padding: 4px 12px; border-radius: 20px; font-size: 0.85rem;">
+        {{ issue.status|title }}
+    </span>
+    <p><i class="fas fa-user"></i> {{ issue.user.username }} | <i class="fas fa-building"></i> {{ issue.department }}</p>
+    <p>{{ issue.description }}</p>
+</div>
+{% endfor %}
+"""
+
+# The same row as rendered by track_issue.html now
+CURRENT_ROWS = """
+{% load campus_fixer_tags %}
+{% for issue in issues %}
+<div class="card issue-card status-{{ issue.status }}">
+    <h4>{{ issue.ticket_id }} - {{ issue.category|category_label }} ({{ issue.location }})</h4>
+    <span class="status-pill">{{ issue.status|status_label }}</span>
+    <p><i class="fas fa-user"></i> {{ issue.user.username }} | <i class="fas fa-building"></i> {{ issue.department|department_label }}</p>
+    <p>{{ issue.description }}</p>
+</div>
+{% endfor %}
+"""
+
+
+class Command(BaseCommand):
+    help = "Time per-row rendering of the issue listing, before and after precomputed labels."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        user = User(username='bench')
+        statuses = [status for status, _ in Issue.STATUS_CHOICES]
+        issues = [
+            Issue(
+                ticket_id=f"UAP{i:08d}", user=user, category='electrical', department='CSE',
+                location='Room 101', description='Light is flickering', status=statuses[i % len(statuses)],
+            )
+            for i in range(options['rows'])
+        ]
+        context = {'issues': issues}
+        engine = engines['django']
+
+        self.stdout.write(f"Rendering {len(issues)} rows, best of {options['repeat']}:")
+        for label, source in (('baseline', BASELINE_ROWS), ('current', CURRENT_ROWS)):
+            template = engine.from_string(source)
+            elapsed, size = self.best_of(options['repeat'], lambda: template.render(context))
+            self.stdout.write(
+                f"  {label:9} {elapsed * 1000:8.1f} ms  {elapsed * 1e6 / len(issues):6.1f} us/row  {size / 1024:7.1f} KB"
+            )
+
+        # The whole page, as served
+        request = RequestFactory().get('/track-issue/')
+        request.user = AnonymousUser()
+        elapsed, size = self.best_of(
+            options['repeat'], lambda: render_to_string('campus_fixer/track_issue.html', context, request),
+        )
+        self.stdout.write(f"  {'page':9} {elapsed * 1000:8.1f} ms  {'':15}  {size / 1024:7.1f} KB")
+
+    def best_of(self, repeat, render):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = render()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, len(output)
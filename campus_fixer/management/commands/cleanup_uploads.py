@@ -0,0 +1,43 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from campus_fixer.models import ChunkedUpload
+from campus_fixer.uploads import discard_upload, expired_uploads
+
+
+class Command(BaseCommand):
+    help = "Delete chunked uploads that were never attached, and their partial files."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=settings.UPLOAD_EXPIRY_HOURS,
+                            help="Delete uploads started more than this many hours ago.")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only report how many uploads would be deleted.")
+
+    def handle(self, *args, **options):
+        uploads = expired_uploads(options['hours'])
+        if options['dry_run']:
+            self.stdout.write(f"{uploads.count()} uploads would be deleted")
+            return
+
+        total = 0
+        for upload in uploads.iterator():
+            discard_upload(upload)
+            total += 1
+
+        # .part files left behind without a row, e.g. when the user was deleted
+        directory = os.path.join(settings.MEDIA_ROOT, 'uploads', 'partial')
+        cutoff = time.time() - options['hours'] * 3600
+        known = {str(upload_id) for upload_id in ChunkedUpload.objects.values_list('upload_id', flat=True)}
+        orphans = 0
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                if name.removesuffix('.part') not in known and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    orphans += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {total} uploads and {orphans} orphaned files"))
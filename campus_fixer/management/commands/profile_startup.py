@@ -0,0 +1,98 @@
+import json
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Runs in a fresh interpreter so nothing is imported yet
+CHILD = """
+import json, os, time
+start = time.perf_counter()
+
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, AttributeError, ValueError):
+        return None  # not Linux
+
+stages = []
+def mark(name):
+    stages.append([name, (time.perf_counter() - start) * 1000, rss_mb()])
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'uap_campus_fixer.settings')
+import django
+django.setup()
+mark('django.setup()')
+
+if {warmup}:
+    from campus_fixer.utils.startup import warm_up
+    warm_up()
+    mark('warm-up (views + templates)')
+
+from django.test import Client
+client = Client()
+request_start = time.perf_counter()
+client.get('/login/')
+first_request = (time.perf_counter() - request_start) * 1000
+mark('first response')
+
+# Wall clock, so the parent can measure from the moment it spawned us
+print(json.dumps({{'stages': stages, 'first_request': first_request, 'done_at': time.time()}}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Profile worker start-up: import time per package, RSS per stage and first-request latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=15, help="Number of packages to list.")
+        parser.add_argument('--runs', type=int, default=5, help="Worker spawns timed per variant.")
+
+    def run_child(self, warmup, importtime=False):
+        flags = ['-X', 'importtime'] if importtime else []
+        spawned_at = time.time()
+        result = subprocess.run(
+            [sys.executable, *flags, '-c', CHILD.format(warmup=warmup)],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        )
+        run = json.loads(result.stdout.strip().splitlines()[-1])
+        run['spawn_to_response'] = (run['done_at'] - spawned_at) * 1000
+        return run, result.stderr
+
+    def handle(self, *args, **options):
+        _, importtime = self.run_child(warmup=False, importtime=True)
+
+        # Lines look like "import time:  self [us] | cumulative | imported package"
+        per_package = Counter()
+        for line in importtime.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            own, _, name = line[len('import time:'):].split('|')
+            per_package[name.strip().split('.')[0]] += int(own)
+
+        self.stdout.write(f"Import time by package (top {options['top']}):")
+        for name, micros in per_package.most_common(options['top']):
+            self.stdout.write(f"  {name:30} {micros / 1000:8.1f} ms")
+
+        # What a user waiting on a freshly spawned worker sees: from process
+        # start to the first response, whatever happens in between
+        runs = {label: [self.run_child(warmup)[0] for _ in range(options['runs'])]
+                for label, warmup in (("Without warm-up", False), ("With warm-up", True))}
+        self.stdout.write(f"\nSpawn to first response (median of {options['runs']}):")
+        for label, results in runs.items():
+            median = statistics.median(run['spawn_to_response'] for run in results)
+            self.stdout.write(f"  {label:30} {median:8.1f} ms")
+
+        for label, results in runs.items():
+            run = results[-1]
+            self.stdout.write(f"\n{label}, by stage (last run):")
+            for name, elapsed, rss in run['stages']:
+                rss = f"{rss:7.1f} MB" if rss is not None else "      n/a"
+                self.stdout.write(f"  {name:30} {elapsed:8.1f} ms  RSS {rss}")
+            # Only the request itself; warm-up moves work before it rather than removing it
+            self.stdout.write(f"  request handling alone took {run['first_request']:.1f} ms")
@@ -0,0 +1,37 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from campus_fixer.exports import claim_next_job, run_export_job
+from campus_fixer.models import ExportJob
+
+
+class Command(BaseCommand):
+    help = "Write queued background issue exports and notify the staff who asked for them."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help="Keep polling for new jobs instead of exiting when the queue is empty.")
+        parser.add_argument('--interval', type=int, default=5,
+                            help="Seconds between polls with --loop.")
+        parser.add_argument('--stale-minutes', type=int, default=30,
+                            help="Re-queue jobs left running this long by a runner that died.")
+
+    def handle(self, *args, **options):
+        while True:
+            stale = timezone.now() - timedelta(minutes=options['stale_minutes'])
+            requeued = ExportJob.objects.filter(status='running', started_at__lt=stale).update(status='pending')
+            if requeued:
+                self.stdout.write(f"Re-queued {requeued} stalled exports")
+
+            while (job := claim_next_job()) is not None:
+                if run_export_job(job):
+                    self.stdout.write(self.style.SUCCESS(f"Export {job.token} done"))
+                else:
+                    self.stdout.write(self.style.ERROR(f"Export {job.token} failed: {job.error}"))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
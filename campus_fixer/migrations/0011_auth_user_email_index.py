@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('campus_fixer', '0010_issue_is_emergency'),
+    ]
+
+    # auth.User belongs to Django, so the email index used by EmailBackend
+    # and the register check is added with raw SQL.
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS campus_fixer_auth_user_email_idx ON auth_user (email);',
+            reverse_sql='DROP INDEX IF EXISTS campus_fixer_auth_user_email_idx;',
+        ),
+    ]
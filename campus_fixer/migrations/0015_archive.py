@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:34
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campus_fixer', '0014_issue_admin_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedIssue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticket_id', models.CharField(max_length=20, unique=True)),
+                ('anonymous', models.BooleanField(default=False)),
+                ('user_type', models.CharField(choices=[('student', 'Student'), ('faculty', 'Faculty'), ('staff', 'Staff')], max_length=10)),
+                ('department', models.CharField(choices=[('CSE', 'CSE'), ('EEE', 'EEE'), ('ARCHITECTURE', 'Architecture'), ('CIVIL', 'Civil Engineering'), ('BBA', 'BBA'), ('ENGLISH', 'English'), ('LAW', 'Law'), ('PHARMACY', 'Pharmacy'), ('OTHERS', 'Others')], max_length=20)),
+                ('category', models.CharField(choices=[('electrical', 'Electrical'), ('plumbing', 'Plumbing'), ('cleanliness', 'Cleanliness'), ('it', 'IT'), ('furniture', 'Furniture'), ('safety', 'Safety'), ('lost_found', 'Lost & Found'), ('suggestions', 'Suggestions'), ('others', 'Others')], max_length=20)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('urgent', 'Urgent')], max_length=10)),
+                ('building', models.CharField(choices=[('academic', 'Academic Building'), ('library', 'Library'), ('hostel', 'RH Home Center'), ('cafeteria', 'Cafeteria'), ('sports', 'Gaming Room'), ('admin', 'Administrative Building')], max_length=50)),
+                ('location', models.CharField(blank=True, max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('image', models.ImageField(blank=True, null=True, upload_to='issues/')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('is_emergency', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedComment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('comment_text', models.TextField()),
+                ('created_at', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='campus_fixer.archivedissue')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedIssueUpdate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('update_text', models.TextField()),
+                ('created_at', models.DateTimeField()),
+                ('issue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='updates', to='campus_fixer.archivedissue')),
+                ('updated_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedissue',
+            index=models.Index(fields=['status'], name='archived_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedissue',
+            index=models.Index(fields=['created_at'], name='archived_created_idx'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.utils import timezone
+import os
 import uuid
 
 
@@ -97,7 +99,34 @@ class Issue(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_emergency = models.BooleanField(default=False)
 
-    
+    class Meta:
+        indexes = [
+            # Delta sync and cursor pagination in the API
+            models.Index(fields=['updated_at', 'id'], name='issue_updated_idx'),
+            # Admin changelist filters and date drill-down
+            models.Index(fields=['status'], name='issue_status_idx'),
+            models.Index(fields=['priority'], name='issue_priority_idx'),
+            models.Index(fields=['building'], name='issue_building_idx'),
+            models.Index(fields=['category'], name='issue_category_idx'),
+            models.Index(fields=['department'], name='issue_department_idx'),
+            models.Index(fields=['created_at'], name='issue_created_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded status so signals can tell when it changes
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Archived tickets keep their IDs, so a new ticket must not reuse one.
+        # Checked here rather than in generate_ticket_id(), which migrations call.
+        if self._state.adding:
+            while ArchivedIssue.objects.filter(ticket_id=self.ticket_id).exists():
+                self.ticket_id = generate_ticket_id()
+        super().save(*args, **kwargs)
+
     def _str_(self):
         return f"{self.ticket_id} - {self.category}"
 
@@ -125,4 +154,160 @@ class LostFoundComment(models.Model):
 
 
     def _str_(self):
-        return f"Comment by {self.user.username} on {self.post.ticket_id}"
\ No newline at end of file
+        return f"Comment by {self.user.username} on {self.post.ticket_id}"
+
+
+
+# ---------------------- CHUNKED UPLOADS ----------------------
+class ChunkedUpload(models.Model):
+    upload_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    filename = models.CharField(max_length=255)
+    total_size = models.PositiveIntegerField()
+    offset = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    @property
+    def is_complete(self):
+        return self.offset >= self.total_size
+
+    @property
+    def partial_path(self):
+        return os.path.join(settings.MEDIA_ROOT, 'uploads', 'partial', f"{self.upload_id}.part")
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.total_size})"
+
+
+# ---------------------- EXPORT JOBS ----------------------
+# Background exports are queued here and written by `manage.py run_exports`,
+# so a recycled web worker cannot lose them.
+class ExportJob(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    # Random, so the file name cannot be guessed
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    query = models.TextField(blank=True)  # the export form's query string
+    format = models.CharField(max_length=4, default='csv')
+    link = models.CharField(max_length=200)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='exportjob_queue_idx'),
+        ]
+
+    @property
+    def path(self):
+        return os.path.join(settings.EXPORT_ROOT, f"{self.token}.{self.format}")
+
+    def __str__(self):
+        return f"{self.user.username}: {self.format} export ({self.status})"
+
+
+
+
+# ---------------------- ARCHIVE ----------------------
+# Resolved/closed tickets are moved here by `manage.py archive_issues` so the
+# live Issue table only holds open work. Field and related names match Issue,
+# IssueUpdate and LostFoundComment, so templates and serializers work on both.
+class ArchivedIssue(models.Model):
+    ticket_id = models.CharField(max_length=20, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    anonymous = models.BooleanField(default=False)
+    user_type = models.CharField(max_length=10, choices=UserProfile.USER_TYPES)
+    department = models.CharField(max_length=20, choices=Issue.DEPARTMENTS)
+    category = models.CharField(max_length=20, choices=Issue.CATEGORIES)
+    priority = models.CharField(max_length=10, choices=Issue.PRIORITY_CHOICES)
+    building = models.CharField(max_length=50, choices=Issue.BUILDING_CHOICES)
+    location = models.CharField(max_length=200, blank=True)
+    description = models.TextField(blank=True)
+    image = models.ImageField(upload_to='issues/', null=True, blank=True)
+    status = models.CharField(max_length=20, choices=Issue.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    is_emergency = models.BooleanField(default=False)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status'], name='archived_status_idx'),
+            models.Index(fields=['category'], name='archived_category_idx'),
+            models.Index(fields=['department'], name='archived_department_idx'),
+            models.Index(fields=['created_at'], name='archived_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.ticket_id} - {self.category} (archived)"
+
+
+def user_issues(user):
+    """All of a user's tickets, live and archived, newest first."""
+    issues = [
+        *Issue.objects.filter(user=user).select_related('user'),
+        *ArchivedIssue.objects.filter(user=user).select_related('user'),
+    ]
+    return sorted(issues, key=lambda issue: issue.created_at, reverse=True)
+
+
+class ArchivedIssueUpdate(models.Model):
+    issue = models.ForeignKey(ArchivedIssue, on_delete=models.CASCADE, related_name='updates')
+    update_text = models.TextField()
+    updated_by = models.ForeignKey(User, on_delete=models.CASCADE)
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Update for {self.issue.ticket_id}"
+
+
+class ArchivedComment(models.Model):
+    post = models.ForeignKey(ArchivedIssue, on_delete=models.CASCADE, related_name='comments')
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    comment_text = models.TextField()
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Comment by {self.user.username} on {self.post.ticket_id}"
+
+
+
+
+# ---------------------- NOTIFICATIONS ----------------------
+class Notification(models.Model):
+    KINDS = [
+        ('status', 'Status change'),
+        ('update', 'Issue update'),
+        ('comment', 'Lost & Found comment'),
+        ('export', 'Export ready'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    kind = models.CharField(max_length=10, choices=KINDS)
+    message = models.CharField(max_length=255)
+    ticket_id = models.CharField(max_length=20, blank=True)  # kept as text so archiving does not break it
+    link = models.CharField(max_length=200, blank=True)
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='notification_inbox_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}: {self.message}"
+
+
+class NotificationCounter(models.Model):
+    """Unread count per user, kept in step with Notification so the badge is O(1)."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
+    unread = models.PositiveIntegerField(default=0)
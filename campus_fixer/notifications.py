@@ -0,0 +1,47 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .models import Notification, NotificationCounter
+
+
+def unread_cache_key(user_id):
+    return f"notifications:unread:{user_id}"
+
+
+def notify(user_ids, kind, message, ticket_id='', link=''):
+    """Fan one event out to every recipient's inbox and bump their unread counters."""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+
+    with transaction.atomic():
+        Notification.objects.bulk_create([
+            Notification(user_id=user_id, kind=kind, message=message[:255], ticket_id=ticket_id, link=link)
+            for user_id in user_ids
+        ])
+        NotificationCounter.objects.bulk_create(
+            [NotificationCounter(user_id=user_id) for user_id in user_ids], ignore_conflicts=True,
+        )
+        NotificationCounter.objects.filter(user_id__in=user_ids).update(unread=F('unread') + 1)
+        transaction.on_commit(lambda: cache.delete_many([unread_cache_key(u) for u in user_ids]))
+
+
+def unread_count(user_id):
+    """Read the counter from the cache, or its single row on a miss."""
+    key = unread_cache_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = NotificationCounter.objects.filter(user_id=user_id).values_list('unread', flat=True).first() or 0
+        cache.set(key, count)
+    return count
+
+
+def mark_read(user_id, notification_ids):
+    """Mark the given notifications read and take them off the unread counter."""
+    with transaction.atomic():
+        marked = Notification.objects.filter(user_id=user_id, id__in=notification_ids, is_read=False).update(is_read=True)
+        if marked:
+            NotificationCounter.objects.filter(user_id=user_id).update(unread=Greatest(F('unread') - marked, 0))
+            transaction.on_commit(lambda: cache.delete(unread_cache_key(user_id)))
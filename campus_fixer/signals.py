@@ -1,9 +1,35 @@
-from django.db.models.signals import post_save
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.conf import settings
-from .models import Issue
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from .backends import cache_user, user_cache_key
+from django.urls import reverse
+from .models import Issue, IssueUpdate, LostFoundComment
+from .notifications import notify
+from .utils.cache import invalidate, RESOLVED_COUNT_KEY, DASHBOARD_STATS_KEY
 from .utils.sms import send_sms
 
+
+@receiver(post_save, sender=Issue)
+@receiver(post_delete, sender=Issue)
+def issue_changed_clear_cache(sender, instance, **kwargs):
+    invalidate(RESOLVED_COUNT_KEY, DASHBOARD_STATS_KEY)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed_clear_cache(sender, instance, **kwargs):
+    cache.delete(user_cache_key(instance.pk))
+
+
+@receiver(user_logged_in)
+def user_logged_in_cache(sender, request, user, **kwargs):
+    # Runs after last_login is saved, so the first page after login is a cache hit
+    cache_user(user)
+
+
 @receiver(post_save, sender=Issue)
 def issue_created_sms(sender, instance, created, **kwargs):
     if created:
@@ -23,3 +49,52 @@ def issue_created_sms(sender, instance, created, **kwargs):
             message,
             settings.ADMIN_PHONE
         )
+
+
+# ---------------------- NOTIFICATIONS ----------------------
+@receiver(post_save, sender=Issue)
+def issue_status_notification(sender, instance, created, **kwargs):
+    old_status = getattr(instance, '_loaded_status', None)
+    if created or old_status is None or old_status == instance.status:
+        return
+    instance._loaded_status = instance.status
+    # Views set _changed_by; owners are not told about their own changes
+    changed_by = getattr(instance, '_changed_by', None)
+    if changed_by is not None and changed_by.pk == instance.user_id:
+        return
+    notify(
+        [instance.user_id], 'status',
+        f"Your issue {instance.ticket_id} is now {instance.get_status_display()}",
+        ticket_id=instance.ticket_id, link=reverse('track_issue'),
+    )
+
+
+@receiver(post_save, sender=IssueUpdate)
+def issue_update_notification(sender, instance, created, **kwargs):
+    if not created:
+        return
+    issue = instance.issue
+    if issue.user_id != instance.updated_by_id:
+        notify(
+            [issue.user_id], 'update',
+            f"New update on {issue.ticket_id}: {instance.update_text}",
+            ticket_id=issue.ticket_id, link=reverse('track_issue'),
+        )
+
+
+@receiver(post_save, sender=LostFoundComment)
+def comment_notification(sender, instance, created, **kwargs):
+    if not created:
+        return
+    post = instance.post
+    # The poster and everyone else in the thread, except the commenter
+    recipients = set(
+        LostFoundComment.objects.filter(post_id=post.id).values_list('user_id', flat=True).distinct()
+    )
+    recipients.add(post.user_id)
+    recipients.discard(instance.user_id)
+    notify(
+        recipients, 'comment',
+        f"{instance.user.username} commented on {post.ticket_id}: {instance.comment_text}",
+        ticket_id=post.ticket_id, link=reverse('lost_found_feed') + '?type=found',
+    )
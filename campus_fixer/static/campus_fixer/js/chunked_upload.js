@@ -0,0 +1,136 @@
+// UAP Campus Fixer - resumable photo uploads
+//
+// Forms with a data-chunked-upload="<upload start URL>" attribute send their
+// photo to /uploads/ in small pieces before submitting, so a dropped Wi-Fi
+// connection only loses the current piece. The form is then submitted with
+// the upload_id instead of the file. Browsers without fetch/Blob.slice, or a
+// server that refuses the chunked upload, fall back to the plain file input.
+
+(function () {
+    const RETRIES = 5;
+
+    function sleep(ms) {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
+
+    // Remember unfinished uploads so pressing Submit again (or reloading) resumes them
+    function storageKey(file) {
+        return `upload:${file.name}:${file.size}:${file.lastModified}`;
+    }
+
+    class UploadRejected extends Error {}
+
+    async function request(url, options) {
+        const response = await fetch(url, {credentials: 'same-origin', ...options});
+        const data = await response.json().catch(() => ({}));
+        return {status: response.status, data: data};
+    }
+
+    async function startOrResume(startUrl, file, headers) {
+        const saved = localStorage.getItem(storageKey(file));
+        if (saved) {
+            const {status, data} = await request(`${startUrl}${saved}/`, {headers: headers});
+            if (status === 200) return data;
+            localStorage.removeItem(storageKey(file));
+        }
+        const {status, data} = await request(startUrl, {
+            method: 'POST',
+            headers: {...headers, 'Content-Type': 'application/json'},
+            body: JSON.stringify({filename: file.name, size: file.size}),
+        });
+        if (status === 201) {
+            localStorage.setItem(storageKey(file), data.upload_id);
+            return data;
+        }
+        if (status >= 400 && status < 500 && status !== 401 && status !== 404) {
+            throw new UploadRejected(data.error || 'Photo was rejected');
+        }
+        return null;  // chunked uploads unavailable; use the file input
+    }
+
+    async function sendChunks(startUrl, file, state, headers, progress) {
+        const url = `${startUrl}${state.upload_id}/`;
+        let offset = state.offset;
+        let failures = 0;
+
+        while (offset < file.size) {
+            progress(offset / file.size);
+            try {
+                const {status, data} = await request(url, {
+                    method: 'PUT',
+                    headers: {...headers, 'Upload-Offset': String(offset), 'Content-Type': 'application/octet-stream'},
+                    body: file.slice(offset, offset + state.chunk_size),
+                });
+                if (status === 200 || status === 409) {
+                    // 409: the server has a different offset; carry on from there
+                    offset = data.offset;
+                    failures = 0;
+                    continue;
+                }
+                if (status >= 400 && status < 500) {
+                    localStorage.removeItem(storageKey(file));
+                    throw new UploadRejected(data.error || 'Photo was rejected');
+                }
+            } catch (error) {
+                if (error instanceof UploadRejected) throw error;
+            }
+            // Network drop or server error: wait, ask where we are, and retry
+            if (++failures > RETRIES) throw new Error('Connection lost');
+            await sleep(1000 * 2 ** failures);
+            try {
+                const {status, data} = await request(url, {headers: headers});
+                if (status === 200) offset = data.offset;
+            } catch (error) {
+                // still offline; the next PUT will tell
+            }
+        }
+        progress(1);
+    }
+
+    function setUp(form) {
+        const input = form.querySelector('input[type="file"][name="image"]');
+        const button = form.querySelector('[type="submit"]');
+        const status = form.querySelector('.upload-status');
+        const startUrl = form.dataset.chunkedUpload;
+        const show = text => { if (status) status.textContent = text; };
+
+        form.addEventListener('submit', async event => {
+            const file = input && input.files[0];
+            if (!file || form.dataset.uploading) return;
+            event.preventDefault();
+            form.dataset.uploading = '1';
+            if (button) button.disabled = true;
+
+            const headers = {'X-CSRFToken': form.querySelector('[name="csrfmiddlewaretoken"]').value};
+            try {
+                const state = await startOrResume(startUrl, file, headers);
+                if (state) {
+                    await sendChunks(startUrl, file, state, headers, done => {
+                        show(`Uploading photo… ${Math.round(done * 100)}%`);
+                    });
+                    localStorage.removeItem(storageKey(file));
+
+                    const field = document.createElement('input');
+                    field.type = 'hidden';
+                    field.name = 'upload_id';
+                    field.value = state.upload_id;
+                    form.appendChild(field);
+                    input.disabled = true;  // the photo is on the server already
+                    show('Photo uploaded, submitting…');
+                }
+                form.submit();
+            } catch (error) {
+                delete form.dataset.uploading;
+                if (button) button.disabled = false;
+                show(error instanceof UploadRejected
+                    ? error.message
+                    : 'Connection lost. Press submit again to continue the upload.');
+            }
+        });
+    }
+
+    if (!window.fetch || !window.localStorage || !Blob.prototype.slice) return;
+    document.addEventListener('DOMContentLoaded', () => {
+        document.querySelectorAll('form[data-chunked-upload]').forEach(setUp);
+    });
+})();
@@ -0,0 +1,35 @@
+from django import template
+
+from ..models import Issue
+
+register = template.Library()
+
+# Built once at import: {field name: {value: label}} for every Issue choice field.
+# get_FOO_display() rebuilds the choices dict on every call, which adds up in long listings.
+CHOICE_LABELS = {
+    field.name: dict(field.flatchoices)
+    for field in Issue._meta.fields
+    if field.choices
+}
+
+STATUS_ICONS = {
+    'in_progress': 'sync-alt',
+    'resolved': 'check-circle',
+}
+
+
+def _label_filter(labels):
+    def label(value):
+        # Lost & found uses statuses outside STATUS_CHOICES ('lost', 'found')
+        return labels.get(value) or str(value).replace('_', ' ').title()
+    return label
+
+
+# {{ issue.status|status_label }}, {{ issue.category|category_label }}, ...
+for _field, _labels in CHOICE_LABELS.items():
+    register.filter(f"{_field}_label", _label_filter(_labels))
+
+
+@register.filter
+def status_icon(status):
+    return STATUS_ICONS.get(status, 'clock')
@@ -1,3 +1,426 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from PIL import Image
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.conf import settings
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .backends import EmailBackend, USER_CACHE_FIELDS, user_cache_key
+from .archive import archive_batch, find_issue
+from .exports import export_rows
+from .models import ArchivedIssue, ExportJob, Issue, IssueUpdate, LostFoundComment
+from .utils import cache as cache_utils
+from .utils.cache import get_cached, invalidate, RESOLVED_COUNT_KEY, DASHBOARD_STATS_KEY
+
+# Tests never talk to a shared cache, whatever CACHE_BACKEND says
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests'}}
+
+
+# The manifest storage needs `collectstatic` first; tests use plain static URLs
+@override_settings(STORAGES={
+    **settings.STORAGES,
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+class BaseTestCase(TestCase):
+    pass
+
+
+def make_issue(user, **fields):
+    fields = {'category': 'it', 'department': 'CSE', 'user_type': 'student', **fields}
+    return Issue.objects.create(user=user, **fields)
+
+
+class SmsPatchMixin:
+    """Issue creation sends an SMS from a signal; keep tests offline."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch('campus_fixer.signals.send_sms')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+# ---------------------- CACHE ----------------------
+@override_settings(CACHES=LOCMEM_CACHE)
+class GetCachedTests(BaseTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_miss_computes_once(self):
+        compute = mock.Mock(return_value=42)
+        self.assertEqual(get_cached('answer', compute), 42)
+        self.assertEqual(get_cached('answer', compute), 42)
+        compute.assert_called_once()
+        self.assertIsNone(cache.get('answer:lock'))
+
+    def test_soft_expired_value_is_refreshed(self):
+        get_cached('answer', lambda: 1, timeout=60)
+        later = cache_utils.time.time() + 61
+        with mock.patch.object(cache_utils.time, 'time', return_value=later):
+            self.assertEqual(get_cached('answer', lambda: 2, timeout=60), 2)
+        self.assertEqual(get_cached('answer', lambda: 3), 2)
+
+    def test_soft_expired_value_served_while_another_worker_refreshes(self):
+        get_cached('answer', lambda: 1, timeout=60)
+        cache.add('answer:lock', 1)
+        later = cache_utils.time.time() + 61
+        compute = mock.Mock(return_value=2)
+        with mock.patch.object(cache_utils.time, 'time', return_value=later):
+            self.assertEqual(get_cached('answer', compute, timeout=60), 1)
+        compute.assert_not_called()
+
+    def test_waiter_gets_other_workers_value(self):
+        cache.add('answer:lock', 1)
+
+        def other_worker_finishes(seconds):
+            cache.set('answer', (7, cache_utils.time.time() + 60))
+
+        compute = mock.Mock(return_value=8)
+        with mock.patch.object(cache_utils.time, 'sleep', side_effect=other_worker_finishes):
+            self.assertEqual(get_cached('answer', compute), 7)
+        compute.assert_not_called()
+
+    def test_lock_only_released_by_its_holder(self):
+        cache.add('answer:lock', 'other')
+        with mock.patch.object(cache_utils.time, 'sleep'):
+            self.assertEqual(get_cached('answer', lambda: 5, lock_timeout=0.01), 5)
+        self.assertEqual(cache.get('answer:lock'), 'other')
+
+    def test_invalidate(self):
+        get_cached('answer', lambda: 1)
+        invalidate('answer')
+        self.assertEqual(get_cached('answer', lambda: 2), 2)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class IssueCacheInvalidationTests(SmsPatchMixin, BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user = User.objects.create_user('reporter', 'reporter@uap-bd.edu', 'pw12345!x')
+
+    def test_issue_changes_clear_derived_counters(self):
+        for event in ('create', 'update', 'delete'):
+            get_cached(RESOLVED_COUNT_KEY, lambda: 99)
+            get_cached(DASHBOARD_STATS_KEY, lambda: {})
+            if event == 'create':
+                issue = make_issue(self.user)
+            elif event == 'update':
+                issue.status = 'resolved'
+                issue.save()
+            else:
+                issue.delete()
+            self.assertIsNone(cache.get(RESOLVED_COUNT_KEY), event)
+            self.assertIsNone(cache.get(DASHBOARD_STATS_KEY), event)
+
+
+# ---------------------- AUTH ----------------------
+@override_settings(CACHES=LOCMEM_CACHE, USER_CACHE_TIMEOUT=60)
+class CachedUserTests(BaseTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('student', 'student@uap-bd.edu', 'pw12345!x')
+
+    def test_cached_user_has_no_password_hash(self):
+        EmailBackend().get_user(self.user.pk)
+        data, session_hash = cache.get(user_cache_key(self.user.pk))
+        self.assertNotIn(self.user.password, data)
+        self.assertEqual(session_hash, self.user.get_session_auth_hash())
+
+    def test_cached_user_served_without_query(self):
+        EmailBackend().get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            user = EmailBackend().get_user(self.user.pk)
+        self.assertEqual(user.email, 'student@uap-bd.edu')
+
+    def test_password_change_logs_out_other_sessions(self):
+        client = self.client
+        client.login(email='student@uap-bd.edu', password='pw12345!x')
+        self.assertEqual(client.get('/track-issue/').status_code, 200)
+        self.user.set_password('new-pass-456')
+        self.user.save()
+        self.assertEqual(client.get('/track-issue/').status_code, 302)
+
+    def test_inactive_cached_user_is_rejected(self):
+        EmailBackend().get_user(self.user.pk)
+        data, session_hash = cache.get(user_cache_key(self.user.pk))
+        data[USER_CACHE_FIELDS.index('is_active')] = False
+        cache.set(user_cache_key(self.user.pk), (data, session_hash))
+        self.assertIsNone(EmailBackend().get_user(self.user.pk))
+
+    @override_settings(USER_CACHE_TIMEOUT=0)
+    def test_no_user_cache_without_shared_cache(self):
+        EmailBackend().get_user(self.user.pk)
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+
+
+# ---------------------- JSON API ----------------------
+class ApiTests(SmsPatchMixin, BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.owner = User.objects.create_user('owner', 'owner@uap-bd.edu', 'pw12345!x')
+        self.other = User.objects.create_user('other', 'other@uap-bd.edu', 'pw12345!x')
+        self.staff = User.objects.create_user('staff', 'staff@uap-bd.edu', 'pw12345!x', is_staff=True)
+        self.own = make_issue(self.owner)
+        self.private = make_issue(self.other)
+        self.lost = make_issue(self.other, category='lost_found', status='lost')
+        self.client.force_login(self.owner)
+
+    def ticket_ids(self, response):
+        return [row['ticket_id'] for row in response.json()['results']]
+
+    def test_visible_issues_permission_split(self):
+        response = self.client.get('/api/issues/?fields=ticket_id')
+        self.assertCountEqual(self.ticket_ids(response), [self.own.ticket_id, self.lost.ticket_id])
+        self.assertEqual(self.client.get(f'/api/issues/{self.private.ticket_id}/').status_code, 404)
+
+        self.client.force_login(self.staff)
+        response = self.client.get('/api/issues/?fields=ticket_id')
+        self.assertCountEqual(
+            self.ticket_ids(response), [self.own.ticket_id, self.private.ticket_id, self.lost.ticket_id],
+        )
+
+    def test_cursor_round_trip(self):
+        for _ in range(4):
+            make_issue(self.owner)
+        expected = list(
+            Issue.objects.filter(category='lost_found').union(Issue.objects.filter(user=self.owner))
+            .order_by('updated_at', 'id').values_list('ticket_id', flat=True)
+        )
+
+        seen, cursor = [], ''
+        while True:
+            data = self.client.get(f'/api/issues/?fields=ticket_id&limit=2&cursor={cursor}').json()
+            seen += [row['ticket_id'] for row in data['results']]
+            cursor = data['next_cursor']
+            if not data['has_more']:
+                break
+        self.assertEqual(seen, expected)
+
+        # Nothing new: same cursor back, no rows
+        data = self.client.get(f'/api/issues/?fields=ticket_id&cursor={cursor}').json()
+        self.assertEqual((data['results'], data['next_cursor']), ([], cursor))
+
+        # A change shows up on the next sync
+        self.own.status = 'in_progress'
+        self.own.save()
+        data = self.client.get(f'/api/issues/?fields=ticket_id&cursor={cursor}').json()
+        self.assertEqual([row['ticket_id'] for row in data['results']], [self.own.ticket_id])
+
+    def test_fields_limit_selected_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/issues/?fields=ticket_id,status')
+        self.assertEqual(set(response.json()['results'][0]), {'ticket_id', 'status'})
+        select = next(q['sql'] for q in queries.captured_queries if 'campus_fixer_issue' in q['sql'])
+        self.assertNotIn('description', select)
+        self.assertEqual(self.client.get('/api/issues/?fields=password').status_code, 400)
+
+    def test_since(self):
+        Issue.objects.filter(pk=self.lost.pk).update(updated_at=timezone.now() - timedelta(days=10))
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        response = self.client.get('/api/issues/', {'fields': 'ticket_id', 'since': since})
+        self.assertEqual(self.ticket_ids(response), [self.own.ticket_id])
+        for bad in ('junk', '2024-13-01T00:00:00'):
+            self.assertEqual(self.client.get('/api/issues/', {'since': bad}).status_code, 400)
+
+    def test_limit_is_clamped(self):
+        for limit in ('0', '-1'):
+            data = self.client.get(f'/api/issues/?fields=ticket_id&limit={limit}').json()
+            self.assertEqual(len(data['results']), 1)
+            self.assertTrue(data['has_more'])
+            self.assertIsNotNone(data['next_cursor'])
+        self.assertEqual(self.client.get('/api/issues/?limit=x').status_code, 400)
+
+    def test_patch_needs_json_object(self):
+        url = f'/api/issues/{self.own.ticket_id}/'
+        self.assertEqual(self.client.patch(url, 'status=resolved', 'application/x-www-form-urlencoded').status_code, 415)
+        self.assertEqual(self.client.patch(url, '["resolved"]', 'application/json').status_code, 400)
+        response = self.client.patch(url, '{"status": "resolved"}', 'application/json')
+        self.assertEqual(response.json()['status'], 'resolved')
+
+
+class ApiSessionTests(BaseTestCase):
+
+    def setUp(self):
+        User.objects.create_user('student', 'student@uap-bd.edu', 'pw12345!x')
+        self.client = Client(enforce_csrf_checks=True)
+
+    def log_in(self, password):
+        token = self.client.get('/api/session/').json()['csrf_token']
+        return self.client.post(
+            '/api/session/', {'email': 'student@uap-bd.edu', 'password': password},
+            content_type='application/json', HTTP_X_CSRFTOKEN=token,
+        )
+
+    def test_login_returns_session_and_token(self):
+        self.assertEqual(self.client.get('/api/issues/').status_code, 401)
+        response = self.log_in('pw12345!x')
+        self.assertEqual(response.json()['user']['username'], 'student')
+        self.assertEqual(self.client.get('/api/issues/').status_code, 200)
+
+        token = response.json()['csrf_token']
+        self.assertEqual(self.client.post('/api/session/logout/').status_code, 403)
+        self.assertEqual(self.client.post('/api/session/logout/', HTTP_X_CSRFTOKEN=token).status_code, 200)
+        self.assertEqual(self.client.get('/api/issues/').status_code, 401)
+
+    def test_wrong_password(self):
+        self.assertEqual(self.log_in('wrong').status_code, 401)
+
+
+# ---------------------- CHUNKED UPLOADS ----------------------
+class ChunkedUploadTests(SmsPatchMixin, BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        settings_override = override_settings(MEDIA_ROOT=media, UPLOAD_CHUNK_SIZE=1024)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user('student', 'student@uap-bd.edu', 'pw12345!x')
+        self.client.force_login(self.user)
+        photo = io.BytesIO()
+        Image.effect_noise((64, 64), 64).convert('RGB').save(photo, 'PNG')
+        self.photo = photo.getvalue()
+
+    def put(self, upload_id, offset, size=1024):
+        return self.client.put(
+            f'/uploads/{upload_id}/', self.photo[offset:offset + size],
+            content_type='application/octet-stream', HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def test_resume_and_submit_report(self):
+        response = self.client.post(
+            '/uploads/', {'filename': 'leak.png', 'size': len(self.photo)}, content_type='application/json',
+        )
+        upload_id = response.json()['upload_id']
+        self.put(upload_id, 0)
+
+        # After a dropped connection the client asks where to carry on
+        offset = self.client.get(f'/uploads/{upload_id}/').json()['offset']
+        self.assertEqual(offset, 1024)
+        self.assertEqual(self.put(upload_id, offset + 1024).status_code, 409)
+        while offset < len(self.photo):
+            offset = self.put(upload_id, offset).json()['offset']
+
+        self.client.post('/report-issue/', {
+            'category': 'plumbing', 'priority': 'high', 'building': 'library', 'department': 'CSE',
+            'location': 'Room 1', 'description': 'Leak', 'upload_id': upload_id,
+        })
+        issue = Issue.objects.get(user=self.user)
+        with issue.image.open('rb') as f:
+            self.assertEqual(f.read(), self.photo)
+
+    def test_report_form_uses_chunked_upload(self):
+        response = self.client.get('/report-issue/')
+        self.assertContains(response, 'data-chunked-upload="/uploads/"')
+        self.assertContains(response, 'chunked_upload.js')
+
+
+# ---------------------- EXPORTS ----------------------
+class ExportTests(SmsPatchMixin, BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.staff = User.objects.create_user('staff', 'staff@uap-bd.edu', 'pw12345!x', is_staff=True)
+        self.client.force_login(self.staff)
+
+    def test_formulas_are_quoted(self):
+        User.objects.filter(pk=self.staff.pk).update(username='=cmd')
+        make_issue(self.staff, location='+1 floor', description='=HYPERLINK("http://evil")')
+        make_issue(self.staff, location='@SUM(A1)', description='-2 chairs')
+        make_issue(self.staff, location='Room 1', description='\tTabbed')
+        rows = list(export_rows({}))[1:]
+        cells = [(row[1], row[7], row[-1]) for row in rows]
+        self.assertEqual(cells, [
+            ("'=cmd", "'+1 floor", '\'=HYPERLINK("http://evil")'),
+            ("'=cmd", "'@SUM(A1)", "'-2 chairs"),
+            ("'=cmd", 'Room 1', "'\tTabbed"),
+        ])
+
+    def test_csv_is_streamed(self):
+        make_issue(self.staff, description='=1+1')
+        response = self.client.get('/export/issues/')
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn("'=1+1", content)
+
+    def test_large_xlsx_goes_to_background(self):
+        make_issue(self.staff)
+        with mock.patch('campus_fixer.exports.XLSX_INLINE_ROWS', 0):
+            response = self.client.get('/export/issues/?format=xlsx')
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(ExportJob.objects.get().format, 'xlsx')
+
+        response = self.client.get('/export/issues/?format=xlsx')
+        self.assertEqual(response['Content-Disposition'].split('.')[-1], 'xlsx"')
+        self.assertEqual(ExportJob.objects.count(), 1)
+
+
+# ---------------------- ARCHIVE ----------------------
+class ArchiveTests(SmsPatchMixin, BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.owner = User.objects.create_user('owner', 'owner@uap-bd.edu', 'pw12345!x')
+        self.staff = User.objects.create_superuser('staff', 'staff@uap-bd.edu', 'pw12345!x')
+        issue = make_issue(self.owner, status='resolved')
+        post = make_issue(self.owner, category='lost_found', status='resolved')
+        IssueUpdate.objects.create(issue=issue, update_text='Fixed the tap', updated_by=self.staff)
+        LostFoundComment.objects.create(post=post, user=self.staff, comment_text='Is it blue?')
+        Issue.objects.update(updated_at=timezone.now() - timedelta(days=400))
+        self.assertEqual(archive_batch(days=180, batch_size=10), 2)
+        self.ticket, self.post = issue.ticket_id, post.ticket_id
+
+    def test_find_issue(self):
+        self.assertIsInstance(find_issue(self.ticket), ArchivedIssue)
+        self.assertIsNone(find_issue(self.ticket, user=self.staff))
+        live = make_issue(self.owner)
+        self.assertEqual(find_issue(live.ticket_id), live)
+
+    def test_api_reads_archived_tickets(self):
+        self.client.force_login(self.owner)
+        self.assertEqual(self.client.get(f'/api/issues/{self.ticket}/?fields=status').json(), {'status': 'resolved'})
+        updates = self.client.get(f'/api/issues/{self.ticket}/updates/').json()['results']
+        self.assertEqual([u['update_text'] for u in updates], ['Fixed the tap'])
+        comments = self.client.get(f'/api/issues/{self.post}/comments/').json()['results']
+        self.assertEqual([c['comment_text'] for c in comments], ['Is it blue?'])
+        response = self.client.post(f'/api/issues/{self.post}/comments/', {'comment_text': 'hi'}, 'application/json')
+        self.assertEqual(response.status_code, 409)
+
+    def test_admin_shows_archived_history(self):
+        self.client.force_login(self.staff)
+        archived = ArchivedIssue.objects.get(ticket_id=self.ticket)
+        response = self.client.get(f'/admin/campus_fixer/archivedissue/{archived.pk}/change/')
+        self.assertContains(response, 'Fixed the tap')
+        response = self.client.get('/admin/campus_fixer/archivedissue/')
+        self.assertContains(response, self.ticket)
+        self.assertNotContains(response, 'ArchivedIssue object')
+
+
+# ---------------------- STATIC FILES ----------------------
+class StaticFilesTests(BaseTestCase):
+
+    def test_collectstatic_hashes_css(self):
+        static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_root)
+        manifest = {'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'}
+        with override_settings(STATIC_ROOT=static_root, STORAGES={**settings.STORAGES, 'staticfiles': manifest}):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            from django.contrib.staticfiles.storage import staticfiles_storage
+            url = staticfiles_storage.url('campus_fixer/css/base.css')
+        self.assertRegex(url, r'^/static/campus_fixer/css/base\.[0-9a-f]{12}\.css$')
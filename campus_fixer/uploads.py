@@ -0,0 +1,144 @@
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+
+from .api import api_view, ApiError, request_data
+from .models import ChunkedUpload, Issue
+
+READ_BLOCK = 64 * 1024
+
+# Leading bytes of the image types we accept
+SIGNATURES = [b'\xff\xd8\xff', b'\x89PNG\r\n\x1a\n', b'GIF87a', b'GIF89a', b'RIFF']
+
+
+def _state(upload):
+    return {
+        'upload_id': str(upload.upload_id),
+        'offset': upload.offset,
+        'total_size': upload.total_size,
+        'chunk_size': settings.UPLOAD_CHUNK_SIZE,
+        'complete': upload.is_complete,
+    }
+
+
+def discard_upload(upload):
+    if os.path.exists(upload.partial_path):
+        os.remove(upload.partial_path)
+    upload.delete()
+
+
+def expired_uploads(hours=None):
+    """Uploads started more than `hours` ago that were never attached."""
+    hours = settings.UPLOAD_EXPIRY_HOURS if hours is None else hours
+    return ChunkedUpload.objects.filter(created_at__lt=timezone.now() - timedelta(hours=hours))
+
+
+def claim_upload(user, upload_id):
+    """Return the user's finished upload with this id, or None."""
+    if not upload_id:
+        return None
+    try:
+        upload = ChunkedUpload.objects.get(upload_id=upload_id, user=user)
+    except (ChunkedUpload.DoesNotExist, ValueError):
+        return None
+    return upload if upload.is_complete else None
+
+
+def attach_upload(upload, issue):
+    """Move a finished upload into storage as the issue's image."""
+    with open(upload.partial_path, 'rb') as f:
+        issue.image.save(upload.filename, File(f), save=True)
+    discard_upload(upload)
+
+
+# ---------------------- START ----------------------
+@api_view('POST')
+def upload_start(request):
+    data = request_data(request)
+    filename = os.path.basename(data.get('filename') or '')
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension not in settings.UPLOAD_IMAGE_TYPES:
+        raise ApiError(f"Only {', '.join(settings.UPLOAD_IMAGE_TYPES)} images are allowed")
+    try:
+        total_size = int(data.get('size'))
+    except (TypeError, ValueError):
+        raise ApiError("size is required")
+    if not 0 < total_size <= settings.UPLOAD_MAX_SIZE:
+        raise ApiError(f"Images must be at most {settings.UPLOAD_MAX_SIZE // (1024 * 1024)} MB", status=413)
+
+    for upload in expired_uploads().filter(user=request.user):
+        discard_upload(upload)
+    if ChunkedUpload.objects.filter(user=request.user).count() >= settings.UPLOAD_MAX_OPEN:
+        raise ApiError("Too many uploads in progress; finish or wait for the others to expire", status=429)
+
+    upload = ChunkedUpload.objects.create(user=request.user, filename=filename, total_size=total_size)
+    os.makedirs(os.path.dirname(upload.partial_path), exist_ok=True)
+    open(upload.partial_path, 'wb').close()
+    return JsonResponse(_state(upload), status=201)
+
+
+# ---------------------- CHUNKS ----------------------
+@api_view('GET', 'PUT')
+def upload_chunk(request, upload_id):
+    """
+    GET returns how much has arrived so a client can resume after a drop.
+    PUT writes the raw request body at the `Upload-Offset` header position;
+    resending a chunk simply overwrites it.
+    """
+    upload = get_object_or_404(ChunkedUpload, upload_id=upload_id, user=request.user)
+    if request.method == 'GET':
+        return JsonResponse(_state(upload))
+
+    try:
+        offset = int(request.headers['Upload-Offset'])
+        length = int(request.headers['Content-Length'])
+    except (KeyError, ValueError):
+        raise ApiError("Upload-Offset and Content-Length headers are required")
+    if length > settings.UPLOAD_CHUNK_SIZE:
+        raise ApiError(f"Chunks must be at most {settings.UPLOAD_CHUNK_SIZE} bytes", status=413)
+    if not 0 <= offset <= upload.offset or offset + length > upload.total_size:
+        return JsonResponse({'error': "Offset does not match the upload", **_state(upload)}, status=409)
+
+    # Stream the body to disk in small blocks instead of loading request.body
+    with open(upload.partial_path, 'r+b') as f:
+        f.seek(offset)
+        received = 0
+        while received < length:
+            block = request.read(min(READ_BLOCK, length - received))
+            if not block:
+                break
+            if offset == 0 and received == 0 and not block.startswith(tuple(SIGNATURES)):
+                discard_upload(upload)
+                raise ApiError("File is not a supported image", status=415)
+            f.write(block)
+            received += len(block)
+
+    upload.offset = max(upload.offset, offset + received)
+    upload.save(update_fields=['offset'])
+
+    if upload.is_complete:
+        from PIL import Image
+
+        try:
+            with Image.open(upload.partial_path) as image:
+                image.verify()
+        except Exception:
+            discard_upload(upload)
+            raise ApiError("File is not a valid image", status=415)
+    return JsonResponse(_state(upload))
+
+
+# ---------------------- ATTACH ----------------------
+@api_view('POST')
+def upload_attach(request, upload_id):
+    upload = claim_upload(request.user, upload_id)
+    if upload is None:
+        raise ApiError("Upload is missing or not finished")
+    issue = get_object_or_404(Issue, ticket_id=request_data(request).get('ticket_id'), user=request.user)
+    attach_upload(upload, issue)
+    return JsonResponse({'ticket_id': issue.ticket_id, 'image': issue.image.url})
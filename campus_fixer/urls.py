@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import views, api, uploads, exports
 
 
 
@@ -14,4 +14,21 @@ urlpatterns = [
     path('update-issue/<str:ticket_id>/', views.update_issue, name='update_issue'),
     path('lost-found-feed/', views.lost_found_feed, name='lost_found_feed'),
     path('ajax/resolved-count/', views.issues_resolved_count, name='issues_resolved_count'),
+    path('export/issues/', exports.export_issues, name='export_issues'),
+    path('export/issues/<uuid:token>/', exports.export_download, name='export_download'),
+    path('notifications/', views.notifications, name='notifications'),
+    path('ajax/notifications/unread/', views.notifications_unread, name='notifications_unread'),
+
+    # JSON API for mobile clients
+    path('api/session/', api.session, name='api_session'),
+    path('api/session/logout/', api.session_logout, name='api_session_logout'),
+    path('api/issues/', api.issue_list, name='api_issue_list'),
+    path('api/issues/<str:ticket_id>/', api.issue_detail, name='api_issue_detail'),
+    path('api/issues/<str:ticket_id>/updates/', api.issue_updates, name='api_issue_updates'),
+    path('api/issues/<str:ticket_id>/comments/', api.issue_comments, name='api_issue_comments'),
+
+    # Chunked, resumable photo uploads
+    path('uploads/', uploads.upload_start, name='upload_start'),
+    path('uploads/<uuid:upload_id>/', uploads.upload_chunk, name='upload_chunk'),
+    path('uploads/<uuid:upload_id>/attach/', uploads.upload_attach, name='upload_attach'),
 ]
@@ -0,0 +1,95 @@
+import time
+from collections import Counter
+
+from django.core.cache import cache
+
+STATS_KEYS = ('hits', 'misses', 'refreshes')
+
+# Counters are kept per process and pushed to the shared cache in batches, so
+# get_cached() does not pay an extra cache round trip on every call.
+STATS_FLUSH_EVERY = 100
+STATS_FLUSH_SECONDS = 30
+
+# Keys for values derived from the Issue table, cleared by signals on change.
+RESOLVED_COUNT_KEY = 'issues:resolved_count'
+DASHBOARD_STATS_KEY = 'issues:dashboard_stats'
+
+
+_pending = Counter()
+_last_flush = time.monotonic()
+
+
+def _flush_stats():
+    global _last_flush
+    _last_flush = time.monotonic()
+    pending = dict(_pending)
+    _pending.clear()
+    for name, count in pending.items():
+        key = f"cache_stats:{name}"
+        # add() is a no-op if the counter exists, so incr() never sees a missing key
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            pass
+
+
+def _record(name):
+    _pending[name] += 1
+    if sum(_pending.values()) >= STATS_FLUSH_EVERY or time.monotonic() - _last_flush >= STATS_FLUSH_SECONDS:
+        _flush_stats()
+
+
+def cache_stats():
+    """Hit/miss counters shared by every worker using the same cache."""
+    _flush_stats()
+    stats = cache.get_many([f"cache_stats:{name}" for name in STATS_KEYS])
+    return {name: stats.get(f"cache_stats:{name}", 0) for name in STATS_KEYS}
+
+
+def get_cached(key, compute, timeout=60, lock_timeout=10):
+    """
+    Return the cached value for `key`, calling `compute()` to fill it.
+
+    Values are stored with a soft expiry: once it passes, one worker takes a
+    lock and recomputes while the others keep serving the old value, so a
+    popular key never expires for everybody at once (cache stampede).
+    """
+    lock_key = f"{key}:lock"
+    acquired = False
+    entry = cache.get(key)
+
+    if entry is not None:
+        value, refresh_at = entry
+        if time.time() < refresh_at or not cache.add(lock_key, 1, lock_timeout):
+            _record('hits')
+            return value
+        acquired = True
+        _record('refreshes')
+    else:
+        _record('misses')
+        acquired = cache.add(lock_key, 1, lock_timeout)
+        if not acquired:
+            # Another worker is computing it; wait for its result.
+            deadline = time.time() + lock_timeout
+            while time.time() < deadline:
+                time.sleep(0.05)
+                entry = cache.get(key)
+                if entry is not None:
+                    return entry[0]
+            # Gave up waiting: compute without the lock, which still belongs
+            # to the other worker.
+
+    try:
+        value = compute()
+        # Keep the entry around twice as long so stale values can be served
+        # while the refresh is running.
+        cache.set(key, (value, time.time() + timeout), timeout * 2)
+    finally:
+        if acquired:
+            cache.delete(lock_key)
+    return value
+
+
+def invalidate(*keys):
+    cache.delete_many(keys)
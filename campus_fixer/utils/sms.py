@@ -1,6 +1,7 @@
-import requests
-
 def send_sms(api_key, message, recipient):
+    # Imported here so worker start-up does not pay for `requests`
+    import requests
+
     url = "https://api.sms.net.bd/sendsms"
 
     payload = {
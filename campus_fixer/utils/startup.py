@@ -0,0 +1,26 @@
+from pathlib import Path
+
+from django.apps import apps
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+from django.template.loader import get_template
+from django.urls import get_resolver
+
+
+def warm_templates():
+    """Compile every campus_fixer template into the cached template loader."""
+    templates_dir = Path(apps.get_app_config('campus_fixer').path) / 'templates'
+    for path in templates_dir.rglob('*.html'):
+        try:
+            get_template(path.relative_to(templates_dir).as_posix())
+        except (TemplateDoesNotExist, TemplateSyntaxError):
+            # A broken template should fail its own page, not the worker
+            pass
+
+
+def warm_up():
+    """
+    Do the first-request work while the worker is starting: import the URLconf
+    (and with it every view module) and precompile the templates.
+    """
+    get_resolver().url_patterns
+    warm_templates()
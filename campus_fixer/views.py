@@ -4,12 +4,99 @@ from django.contrib import messages
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
-from .models import Issue, UserProfile, LostFoundComment
+from django.db.models import Count, Max, Q
+from django.views.decorators.http import condition
+from .models import Issue, UserProfile, LostFoundComment, ArchivedIssue, Notification, user_issues
+from .notifications import unread_count, mark_read
+from .uploads import claim_upload, attach_upload
+from .utils.cache import get_cached, RESOLVED_COUNT_KEY, DASHBOARD_STATS_KEY
+import hashlib
 import re
 
+
+def resolved_issue_count():
+    # Archived tickets still count as resolved
+    return get_cached(
+        RESOLVED_COUNT_KEY,
+        lambda: (Issue.objects.filter(status='resolved').count()
+                 + ArchivedIssue.objects.filter(status='resolved').count()),
+    )
+
+
+def issue_stats(model):
+    return model.objects.aggregate(
+        total_issues=Count('id'),
+        pending_issues=Count('id', filter=Q(status='pending')),
+        in_progress_issues=Count('id', filter=Q(status='in_progress')),
+        resolved_issues=Count('id', filter=Q(status='resolved')),
+        closed_issues=Count('id', filter=Q(status='closed')),
+        urgent_issues=Count('id', filter=Q(priority='urgent')),
+    )
+
+
+def dashboard_stats():
+    live, archived = issue_stats(Issue), issue_stats(ArchivedIssue)
+    return {name: live[name] + archived[name] for name in live}
+
+
+# ---------------------- CONDITIONAL GET ----------------------
+# ETags are built from one aggregate query (or a cached counter), so a
+# 304 skips loading the rows and rendering the template.
+
+def _cacheable(request):
+    # Only GETs are answered from the ETag; POSTs would run the query for nothing.
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    # Flash messages are rendered into the page, so never answer 304 while
+    # some are waiting to be shown.
+    storage = getattr(request, '_messages', None)
+    return storage is None or not len(storage)
+
+
+def _etag(request, *parts):
+    # Pages carry {% csrf_token %}, and the CSRF secret rotates on login, so
+    # a cached copy must not outlive it. The tag is hashed to keep it out of headers.
+    csrf_secret = request.META.get('CSRF_COOKIE', '')
+    value = '-'.join(str(part) for part in (request.user.pk, csrf_secret, *parts))
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def track_issue_etag(request):
+    if not _cacheable(request):
+        return None
+    state = Issue.objects.filter(user=request.user).aggregate(
+        count=Count('id'), updated=Max('updated_at'),
+    )
+    archived = ArchivedIssue.objects.filter(user=request.user).count()
+    return _etag(request, state['count'], archived, state['updated'] and state['updated'].timestamp())
+
+
+def lost_found_feed_etag(request):
+    if not _cacheable(request):
+        return None
+    choice = request.GET.get('type')
+    if choice != 'found':
+        return _etag(request, choice)
+    state = Issue.objects.filter(category='lost_found', status='found').aggregate(
+        count=Count('id', distinct=True),
+        updated=Max('updated_at'),
+        comment_count=Count('comments', distinct=True),
+        last_comment=Max('comments__created_at'),
+    )
+    return _etag(
+        request, choice, state['count'], state['comment_count'],
+        state['updated'] and state['updated'].timestamp(),
+        state['last_comment'] and state['last_comment'].timestamp(),
+    )
+
+
+def resolved_count_etag(request):
+    return str(resolved_issue_count())
+
+
 # ---------------------- HOME ----------------------
 def index(request):
-    issues_resolved = Issue.objects.filter(status='resolved').count()
+    issues_resolved = resolved_issue_count()
     context = {'issues_resolved': issues_resolved}
     return render(request, 'campus_fixer/index.html', context)
 
@@ -57,18 +144,16 @@ def custom_login(request):
             messages.error(request, "Enter valid UAP email (example: student@uap-bd.edu)")
             return redirect('login')
 
-        try:
-            user_obj = User.objects.get(email=email)
-        except User.DoesNotExist:
-            messages.error(request, "No account found with this email.")
-            return redirect('login')
-
-        user = authenticate(request, username=user_obj.username, password=password)
+        # EmailBackend looks the user up by email and checks the password in one query
+        user = authenticate(request, email=email, password=password)
 
         if user:
             login(request, user)
             messages.success(request, f"Welcome back, {user.username}! ✅")
             return redirect('index')  # Redirect to home instead of dashboard
+        elif not User.objects.filter(email=email).exists():
+            messages.error(request, "No account found with this email.")
+            return redirect('login')
         else:
             messages.error(request, "Incorrect password ❌")
             return redirect('login')
@@ -86,21 +171,12 @@ def custom_logout(request):
 # ---------------------- DASHBOARD ----------------------
 @login_required
 def dashboard(request):
-    total_issues = Issue.objects.count()
-    pending_issues = Issue.objects.filter(status='pending').count()
-    in_progress_issues = Issue.objects.filter(status='in_progress').count()
-    resolved_issues = Issue.objects.filter(status='resolved').count()
-    closed_issues = Issue.objects.filter(status='closed').count()
-    urgent_issues = Issue.objects.filter(priority='urgent').count()
+    # All six counters in one aggregate query per table, shared between workers.
+    stats = get_cached(DASHBOARD_STATS_KEY, dashboard_stats)
     recent_issues = Issue.objects.order_by('-created_at')[:5]
 
     context = {
-        'total_issues': total_issues,
-        'pending_issues': pending_issues,
-        'in_progress_issues': in_progress_issues,
-        'resolved_issues': resolved_issues,
-        'closed_issues': closed_issues,
-        'urgent_issues': urgent_issues,
+        **stats,
         'recent_issues': recent_issues,
     }
     return render(request, 'campus_fixer/dashboard.html', context)
@@ -117,6 +193,7 @@ def report_issue(request):
         building = request.POST.get('building')
         department = request.POST.get('department')
         image = request.FILES.get('image')
+        upload = claim_upload(request.user, request.POST.get('upload_id'))
 
 
         is_emergency = True if request.POST.get('is_emergency') == 'on' else False
@@ -124,7 +201,7 @@ def report_issue(request):
         profile = UserProfile.objects.filter(user=request.user).first()
         user_type = profile.user_type if profile else 'student'
 
-        Issue.objects.create(
+        issue = Issue.objects.create(
             user=request.user,
             user_type=user_type,
             department=department,
@@ -137,6 +214,8 @@ def report_issue(request):
             is_emergency=is_emergency
             
         )
+        if upload:
+            attach_upload(upload, issue)
 
         messages.success(request, "Issue reported successfully ✅")
         return redirect('dashboard')
@@ -146,9 +225,10 @@ def report_issue(request):
 
 # ---------------------- TRACK ISSUES ----------------------
 @login_required
+@condition(etag_func=track_issue_etag)
 def track_issue(request):
-    issues = Issue.objects.filter(user=request.user).order_by('-created_at')
-    return render(request, 'campus_fixer/track_issue.html', {'issues': issues})
+    # Archived tickets are still the user's, so they are listed too
+    return render(request, 'campus_fixer/track_issue.html', {'issues': user_issues(request.user)})
 
 
 # ---------------------- UPDATE STATUS ----------------------
@@ -159,6 +239,7 @@ def update_issue(request, ticket_id):
     if request.method == "POST":
         new_status = request.POST.get("status")
         issue.status = new_status
+        issue._changed_by = request.user  # read by the status notification signal
         issue.save()
         messages.success(request, "Status updated ✅")
         return redirect('track_issue')
@@ -168,6 +249,7 @@ def update_issue(request, ticket_id):
 
 # ---------------------- LOST & FOUND FEED ----------------------
 @login_required
+@condition(etag_func=lost_found_feed_etag)
 def lost_found_feed(request):
     choice = request.GET.get('type')  # 'report' or 'found'
 
@@ -187,12 +269,13 @@ def lost_found_feed(request):
         location = request.POST.get('location')
         description = request.POST.get('description')
         image = request.FILES.get('image')
+        upload = claim_upload(request.user, request.POST.get('upload_id'))
 
         if status not in ['lost', 'found']:
             messages.error(request, "Please select Lost or Found ❗")
             return redirect(f"{request.path}?type=report")
 
-        Issue.objects.create(
+        issue = Issue.objects.create(
             user=request.user,
             category='lost_found',
             status=status,
@@ -201,13 +284,20 @@ def lost_found_feed(request):
             description=description,
             image=image
         )
+        if upload:
+            attach_upload(upload, issue)
         messages.success(request, f"{status.capitalize()} item reported successfully ✅")
         return redirect('lost_found_feed')
 
     # --- Display Found Items ---
     found_posts = None
     if choice == 'found':
-        found_posts = Issue.objects.filter(category='lost_found', status='found').order_by('-created_at')
+        found_posts = (
+            Issue.objects.filter(category='lost_found', status='found')
+            .select_related('user')
+            .prefetch_related('comments__user')
+            .order_by('-created_at')
+        )
 
     context = {
         'choice': choice,
@@ -217,6 +307,23 @@ def lost_found_feed(request):
 
 
 # ---------------------- REAL-TIME RESOLVED COUNT ----------------------
+@condition(etag_func=resolved_count_etag)
 def issues_resolved_count(request):
-    resolved_count = Issue.objects.filter(status='resolved').count()
+    resolved_count = resolved_issue_count()
     return JsonResponse({'resolved_count': resolved_count})
+
+
+# ---------------------- NOTIFICATIONS ----------------------
+@login_required
+def notifications(request):
+    inbox = list(Notification.objects.filter(user=request.user).order_by('-created_at')[:50])
+    # Only what is on screen counts as read; older unread rows keep the badge
+    mark_read(request.user.pk, [notification.id for notification in inbox])
+    return render(request, 'campus_fixer/notifications.html', {'notifications': inbox})
+
+
+def notifications_unread(request):
+    # Polled by every page; a cache hit answers without touching the database
+    if not request.user.is_authenticated:
+        return JsonResponse({'unread': 0})
+    return JsonResponse({'unread': unread_count(request.user.pk)})
@@ -14,3 +14,11 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'uap_campus_fixer.settings')
 
 application = get_asgi_application()
+
+# With a preforking server (gunicorn --preload) this runs once in the master
+# and every forked worker starts with views loaded and templates compiled
+from django.conf import settings  # noqa: E402
+
+if settings.STARTUP_WARMUP:
+    from campus_fixer.utils.startup import warm_up
+    warm_up()
@@ -1,6 +1,8 @@
 from pathlib import Path
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -56,6 +58,12 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'uap_campus_fixer.wsgi.application'
 
+# Import views and compile templates when wsgi.py/asgi.py is loaded. This only
+# moves first-request work into start-up, so it saves time only when workers
+# are forked from an already warmed master (e.g. gunicorn --preload). Off by
+# default; set STARTUP_WARMUP=1 for such deployments.
+STARTUP_WARMUP = os.environ.get('STARTUP_WARMUP', '0') == '1'
+
 # Database
 DATABASES = {
     'default': {
@@ -64,6 +72,56 @@ DATABASES = {
     }
 }
 
+# Cache
+# CACHE_BACKEND selects the shared cache used for counters, stats and sessions:
+#   locmem - per-process memory (default, single worker only)
+#   file   - directory on disk shared by all workers on one host
+#   db     - SQLite cache table (run `python manage.py createcachetable` once)
+#   redis  - Redis server at CACHE_LOCATION (needs the `redis` package)
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+CACHE_TIMEOUT = int(os.environ.get('CACHE_TIMEOUT', 300))
+
+_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'campus-fixer'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', os.path.join(BASE_DIR, 'cache')),
+    'db': ('django.core.cache.backends.db.DatabaseCache', 'campus_fixer_cache'),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+if CACHE_BACKEND not in _CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f"Unknown CACHE_BACKEND {CACHE_BACKEND!r}; use one of: {', '.join(_CACHE_BACKENDS)}"
+    )
+_cache_engine, _cache_location = _CACHE_BACKENDS[CACHE_BACKEND]
+
+CACHES = {
+    'default': {
+        'BACKEND': _cache_engine,
+        'LOCATION': os.environ.get('CACHE_LOCATION', _cache_location),
+        'TIMEOUT': CACHE_TIMEOUT,
+        'KEY_PREFIX': 'uap',
+    }
+}
+
+# Sessions and logged-in users are only cached when every worker sees the
+# same cache; with per-process locmem a logout or password change would be
+# missed by the other workers.
+SHARED_CACHE = CACHE_BACKEND in ('file', 'db', 'redis')
+
+# Sessions are read from the cache and only fall back to the database on a
+# miss. Set SESSION_BACKEND=signed_cookies to keep them out of the server.
+SESSION_ENGINE = 'django.contrib.sessions.backends.' + os.environ.get(
+    'SESSION_BACKEND', 'cached_db' if SHARED_CACHE else 'db'
+)
+
+# Authentication: log in by email in one query. With a shared cache the user
+# behind each request is cached for USER_CACHE_TIMEOUT seconds (0 turns it off).
+AUTHENTICATION_BACKENDS = ['campus_fixer.backends.EmailBackend']
+USER_CACHE_TIMEOUT = int(os.environ.get('USER_CACHE_TIMEOUT', 60)) if SHARED_CACHE else 0
+
+# Resolved/closed issues older than this are moved to the archive tables
+# by `python manage.py archive_issues` (run it from a daily cron job)
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 180))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -83,10 +141,35 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+# collectstatic writes content-hashed copies (base.1a2b3c4d.css) and
+# {% static %} links to them, so the web server can cache them forever and a
+# deploy changes the URL of anything that changed.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'},
+}
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Issue exports hold every reporter's data, so they live outside MEDIA_ROOT
+# and are only served to staff by the export_download view.
+EXPORT_ROOT = os.environ.get('EXPORT_ROOT', os.path.join(BASE_DIR, 'exports'))
+
+# Uploads
+# Photos can be sent in chunks to /uploads/ so a dropped connection only
+# loses the current chunk. No single upload may hold more than
+# UPLOAD_CHUNK_SIZE in memory; multipart uploads above it spill to disk.
+UPLOAD_MAX_SIZE = int(os.environ.get('UPLOAD_MAX_SIZE', 10 * 1024 * 1024))
+UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', 512 * 1024))
+UPLOAD_IMAGE_TYPES = ['jpg', 'jpeg', 'png', 'gif', 'webp']
+FILE_UPLOAD_MAX_MEMORY_SIZE = UPLOAD_CHUNK_SIZE
+# Unfinished or unclaimed uploads are removed by `manage.py cleanup_uploads`
+# after UPLOAD_EXPIRY_HOURS; each user may have UPLOAD_MAX_OPEN at a time.
+UPLOAD_EXPIRY_HOURS = int(os.environ.get('UPLOAD_EXPIRY_HOURS', 24))
+UPLOAD_MAX_OPEN = int(os.environ.get('UPLOAD_MAX_OPEN', 5))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 